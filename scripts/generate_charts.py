@@ -5,7 +5,10 @@ Outputs 8 PNG charts to charts/ directory.
 """
 
 import os
+import json
 import warnings
+from multiprocessing import Pool, cpu_count
+import numpy as np
 import pandas as pd
 import matplotlib
 matplotlib.use("Agg")
@@ -21,6 +24,10 @@ warnings.filterwarnings("ignore")
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_PATH = os.path.join(BASE_DIR, "data", "data.csv")
 CHARTS_DIR = os.path.join(BASE_DIR, "charts")
+CACHE_DIR  = os.path.join(BASE_DIR, "data", ".cache")
+CACHE_PATH = os.path.join(CACHE_DIR, "data.parquet")
+CACHE_META = os.path.join(CACHE_DIR, "data.meta.json")
+CACHE_VERSION = 2  # bump whenever prepare_data changes its output
 os.makedirs(CHARTS_DIR, exist_ok=True)
 
 # ---------------------------------------------------------------------------
@@ -57,10 +64,39 @@ def setup_style():
         "axes.facecolor":    "white",
     })
 
+# ---------------------------------------------------------------------------
+# Buckets
+# ---------------------------------------------------------------------------
+PRICE_BINS   = [0, 500, 1000, 1500, 2000, 3000]
+PRICE_LABELS = ["100–500", "501–1,000", "1,001–1,500", "1,501–2,000", "2,001–2,850"]
+
 # ---------------------------------------------------------------------------
 # Data loading
 # ---------------------------------------------------------------------------
 def load_data():
+    """Load the prepared DataFrame, reusing the Parquet cache while data.csv is unchanged."""
+    meta = {"version": CACHE_VERSION, "source_mtime": os.path.getmtime(DATA_PATH)}
+    try:
+        with open(CACHE_META, encoding="utf-8") as f:
+            if json.load(f) == meta:
+                return pd.read_parquet(CACHE_PATH, engine="pyarrow")
+    except (OSError, ValueError, ImportError):
+        pass
+
+    df = prepare_data()
+
+    # Cache is best-effort: skip silently if pyarrow is missing or the dir is read-only
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        df.to_parquet(CACHE_PATH, engine="pyarrow")
+        with open(CACHE_META, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+    except (OSError, ImportError):
+        pass
+
+    return df
+
+def prepare_data():
     df = pd.read_csv(DATA_PATH, encoding="utf-8-sig")
 
     # Keep only active events
@@ -78,20 +114,16 @@ def load_data():
         .str.strip()
     )
 
-    # Rating tiers
-    def rating_tier(r):
-        if pd.isna(r) or r < 1:
-            return "Minimal (1-9)"
-        elif r < 10:
-            return "Minimal (1-9)"
-        elif r < 100:
-            return "Low (10-99)"
-        elif r < 500:
-            return "Mid (100-499)"
-        else:
-            return "Top (500+)"
-
-    df["rating_tier"] = df["rating"].apply(rating_tier)
+    # Rating tiers (missing ratings count as Minimal)
+    df["rating_tier"] = pd.cut(
+        df["rating"].fillna(0),
+        bins=[-np.inf, 10, 100, 500, np.inf],
+        labels=["Minimal (1-9)", "Low (10-99)", "Mid (100-499)", "Top (500+)"],
+        right=False,
+    )
+
+    # Price buckets
+    df["price_bucket"] = pd.cut(df["min_price"], bins=PRICE_BINS, labels=PRICE_LABELS, right=True)
 
     # City — clean encoding artefacts
     df["city"] = df["place_city"].fillna("Unknown").str.strip()
@@ -182,10 +214,10 @@ def chart_4_category_price(df):
     fig, ax = plt.subplots(figsize=(10, 6))
     bars = ax.barh(grp.index, grp["avg_price"], color=ORANGE, edgecolor="white")
 
-    for bar, (_, row) in zip(bars, grp.iterrows()):
-        ax.text(row["avg_price"] + 10,
+    for bar, avg, cnt in zip(bars, grp["avg_price"].values, grp["count"].values):
+        ax.text(avg + 10,
                 bar.get_y() + bar.get_height() / 2,
-                f"{row['avg_price']:,.0f} TRY  (n={int(row['count'])})",
+                f"{avg:,.0f} TRY  (n={int(cnt)})",
                 va="center", ha="left", fontsize=9, color=BLUE_DARK)
 
     ax.set_xlabel("Average Min Price (TRY)")
@@ -200,10 +232,7 @@ def chart_4_category_price(df):
 # Chart 5 · Price Distribution (bucketed)
 # ---------------------------------------------------------------------------
 def chart_5_price_distribution(df):
-    bins   = [0, 500, 1000, 1500, 2000, 3000]
-    labels = ["100–500", "501–1,000", "1,001–1,500", "1,501–2,000", "2,001–2,850"]
-
-    df["price_bucket"] = pd.cut(df["min_price"], bins=bins, labels=labels, right=True)
+    labels = PRICE_LABELS
     counts = df["price_bucket"].value_counts().reindex(labels)
 
     fig, ax = plt.subplots(figsize=(10, 6))
@@ -238,9 +267,9 @@ def chart_6_discount_coverage(df):
     ax.barh(grp.index, grp["full_price"], color=GREY, label="Full-Price", edgecolor="white")
     ax.barh(grp.index, grp["discounted"], left=grp["full_price"], color=GREEN, label="Discounted", edgecolor="white")
 
-    for i, (_, row) in enumerate(grp.iterrows()):
-        ax.text(row["total"] + 0.3, i,
-                f"{row['pct_disc']:.0f}% disc.",
+    for i, (total, pct) in enumerate(zip(grp["total"].values, grp["pct_disc"].values)):
+        ax.text(total + 0.3, i,
+                f"{pct:.0f}% disc.",
                 va="center", ha="left", fontsize=9, color=BLUE_DARK)
 
     ax.set_xlabel("Number of Events")
@@ -329,21 +358,30 @@ def chart_8_rating_tiers(df):
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
+CHARTS = {
+    "chart_1": chart_1_city_count,
+    "chart_2": chart_2_city_price,
+    "chart_3": chart_3_category_count,
+    "chart_4": chart_4_category_price,
+    "chart_5": chart_5_price_distribution,
+    "chart_6": chart_6_discount_coverage,
+    "chart_7": chart_7_provider_share,
+    "chart_8": chart_8_rating_tiers,
+}
+
+def _render(name, df):
+    # Runs in a worker process: rcParams are per-process, so restyle first
+    setup_style()
+    CHARTS[name](df)
+
 def main():
     print("az.bilet.com Business Analysis — Chart Generator")
     print("=" * 50)
-    setup_style()
     df = load_data()
     print(f"  Loaded {len(df)} active events\n")
 
-    chart_1_city_count(df)
-    chart_2_city_price(df)
-    chart_3_category_count(df)
-    chart_4_category_price(df)
-    chart_5_price_distribution(df)
-    chart_6_discount_coverage(df)
-    chart_7_provider_share(df)
-    chart_8_rating_tiers(df)
+    with Pool(min(len(CHARTS), cpu_count())) as pool:
+        pool.starmap(_render, [(name, df) for name in CHARTS])
 
     print(f"\nAll charts saved to: {CHARTS_DIR}")
 